@@ -12,8 +12,9 @@ def initialSolution(puzzle: Grid, seed: Optional[int] = None) -> Grid:
        Fixed cells (non-zero) are preserved.
        For empty puzzles: fills each row with 1-9 randomly (row-valid only).
        For partially filled puzzles: attempts to respect all constraints where possible."""
-    if seed is not None:
-        random.seed(seed)
+    # Local generator: seeding it gives the same sequence as random.seed(seed) did,
+    # without resetting the global random state of the caller
+    rng = random.Random(seed)
     grid = [row[:] for row in puzzle]
     fixed = [[cell != 0 for cell in row] for row in puzzle]
 
@@ -24,31 +25,52 @@ def initialSolution(puzzle: Grid, seed: Optional[int] = None) -> Grid:
         # This gives us a row-valid starting point with conflicts to resolve
         for i in range(9):
             nums = list(range(1, 10))
-            random.shuffle(nums)
+            rng.shuffle(nums)
             grid[i] = nums
         return grid
 
-    # Fallback: for partially filled puzzles, use the previous logic
+    # Fallback: for partially filled puzzles, place values greedily avoiding the values
+    # already used in the cell's row, column, block and diagonals. Used values are kept
+    # as bitmasks (bit v set = value v present) and updated as cells are filled,
+    # instead of rebuilding five sets for every cell.
+    row_used = [0] * 9
+    col_used = [0] * 9
+    block_used = [0] * 9
+    diag1_used = 0
+    diag2_used = 0
+    for i in range(9):
+        for j in range(9):
+            if fixed[i][j]:
+                bit = 1 << grid[i][j]
+                row_used[i] |= bit
+                col_used[j] |= bit
+                block_used[(i // 3) * 3 + j // 3] |= bit
+                if i == j:
+                    diag1_used |= bit
+                if i + j == 8:
+                    diag2_used |= bit
     for i in range(9):
         for j in range(9):
             if not fixed[i][j]:
-                row_vals = set(grid[i])
-                col_vals = set(grid[x][j] for x in range(9))
-                # Block values
-                block_r, block_c = (i // 3) * 3, (j // 3) * 3
-                block_vals = set(grid[block_r + bi][block_c + bj] for bi in range(3) for bj in range(3))
-                diag1_vals = set()
-                diag2_vals = set()
+                b = (i // 3) * 3 + j // 3
+                used = row_used[i] | col_used[j] | block_used[b]
                 if i == j:
-                    diag1_vals = set(grid[d][d] for d in range(9))
+                    used |= diag1_used
                 if i + j == 8:
-                    diag2_vals = set(grid[d][8-d] for d in range(9))
-                used = row_vals | col_vals | block_vals | diag1_vals | diag2_vals
-                candidates = [n for n in range(1, 10) if n not in used]
+                    used |= diag2_used
+                candidates = [n for n in range(1, 10) if not used >> n & 1]
                 if candidates:
-                    grid[i][j] = random.choice(candidates)
+                    val = rng.choice(candidates)
                 else:
-                    present = set(val for val in grid[i] if val != 0)
-                    missing = [n for n in range(1,10) if n not in present]
-                    grid[i][j] = random.choice(missing) if missing else random.randint(1,9)
+                    missing = [n for n in range(1, 10) if not row_used[i] >> n & 1]
+                    val = rng.choice(missing) if missing else rng.randint(1, 9)
+                grid[i][j] = val
+                bit = 1 << val
+                row_used[i] |= bit
+                col_used[j] |= bit
+                block_used[b] |= bit
+                if i == j:
+                    diag1_used |= bit
+                if i + j == 8:
+                    diag2_used |= bit
     return grid
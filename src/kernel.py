@@ -0,0 +1,141 @@
+"""
+This module implements the move-and-cost kernel of the Tabu Search.
+Includes:
+- GridState: flat grid plus incrementally maintained counts, row masks and conflict count
+- Delta cost evaluation of row swaps, fused with tabu-aware move selection
+- In-place application of a row swap
+
+All tables have a fixed size (20 constraint groups x 10 values) and the functions do
+no per-call validation, so tabuSearch stays a thin loop around these calls.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+from sudoku import GridBA
+
+# Flat count table layout: value v of group g is counted at counts[g * 10 + v].
+# Groups: columns 0..8, blocks 9..17, main diagonal 18, anti-diagonal 19.
+_DIAG1 = 180
+_DIAG2 = 190
+# _BLOCK_OFFSET[i][j]: offset of the block count row for cell (i, j)
+_BLOCK_OFFSET = [[(9 + (i // 3) * 3 + j // 3) * 10 for j in range(9)] for i in range(9)]
+# Digit-presence mask of a group holding every value 1..9 (bit v = value v present)
+FULL_MASK = 0x3FE
+INF = float('inf')
+
+@dataclass
+class GridState:
+    """Search state: the flat grid plus incrementally maintained constraint views.
+       counts: digit counts per group (see layout above)
+       row_mask: digit-presence bitmask per row (unchanged by row swaps)
+       dup_count: number of conflicts, equal to computeCost of the grid"""
+    grid: GridBA
+    counts: List[int]
+    row_mask: List[int]
+    dup_count: int
+
+def buildState(grid: GridBA) -> GridState:
+    """Build the search state (counts, row masks and conflict count) of a flat grid."""
+    counts = [0] * 200
+    row_mask = [0] * 9
+    for i in range(9):
+        for j in range(9):
+            v = grid[i*9 + j]
+            counts[j * 10 + v] += 1
+            counts[_BLOCK_OFFSET[i][j] + v] += 1
+            if i == j:
+                counts[_DIAG1 + v] += 1
+            if i + j == 8:
+                counts[_DIAG2 + v] += 1
+            row_mask[i] |= 1 << v
+    dup_count = sum(c - 1 for c in counts if c)
+    return GridState(grid, counts, row_mask, dup_count)
+
+def selectSwap(state: GridState, moves: Iterable[Tuple[int, int, int]],
+               tabu: List[List[List[int]]], iter_count: int, aspiration_d: int):
+    """Score row swaps and select one in a single fused pass (no lists, no sort).
+       A move's delta is its cost change, read from the counts of the two columns, blocks
+       and diagonals it touches: a group loses a conflict if the leaving value was
+       duplicated and gains one if the entering value is already present.
+       Picks the best allowed move - not tabu (tabu[row][a][b] <= iter_count) or with
+       delta below aspiration_d - and falls back to the best move overall if every move
+       is tabu. Strict < keeps the first of equal moves.
+       Returns (move, delta), or (None, 0) if moves is empty."""
+    grid = state.grid
+    counts = state.counts
+    block_offset = _BLOCK_OFFSET
+    best_any = best_allowed = None
+    best_any_d = best_allowed_d = INF
+    for move in moves:
+        row, a, b = move
+        r = row * 9
+        va = grid[r+a]
+        vb = grid[r+b]
+        if va == vb:
+            d = 0
+        else:
+            o = a * 10
+            p = b * 10
+            d = (counts[o+vb] > 0) - (counts[o+va] > 1) + (counts[p+va] > 0) - (counts[p+vb] > 1)
+            o = block_offset[row][a]
+            p = block_offset[row][b]
+            if o != p:
+                d += (counts[o+vb] > 0) - (counts[o+va] > 1) + (counts[p+va] > 0) - (counts[p+vb] > 1)
+            # diagonals (a cell can leave a diagonal only if its partner is not on it)
+            if row == a:
+                d += (counts[_DIAG1+vb] > 0) - (counts[_DIAG1+va] > 1)
+            elif row == b:
+                d += (counts[_DIAG1+va] > 0) - (counts[_DIAG1+vb] > 1)
+            if row + a == 8:
+                d += (counts[_DIAG2+vb] > 0) - (counts[_DIAG2+va] > 1)
+            elif row + b == 8:
+                d += (counts[_DIAG2+va] > 0) - (counts[_DIAG2+vb] > 1)
+        # best_any_d <= best_allowed_d, so only moves below best_allowed_d can change either
+        if d < best_allowed_d:
+            if d < best_any_d:
+                best_any, best_any_d = move, d
+            if tabu[row][a][b] <= iter_count or d < aspiration_d:
+                best_allowed, best_allowed_d = move, d
+    if best_allowed is not None:
+        return best_allowed, best_allowed_d
+    if best_any is not None:
+        return best_any, best_any_d
+    return None, 0
+
+def _replace(state: GridState, o: int, out: int, into: int):
+    """Replace one occurrence of `out` by `into` in the group at count offset o,
+       keeping the conflict count in sync."""
+    counts = state.counts
+    k = o + out
+    counts[k] -= 1
+    if counts[k]:
+        state.dup_count -= 1
+    k = o + into
+    if counts[k]:
+        state.dup_count += 1
+    counts[k] += 1
+
+def applySwap(state: GridState, row: int, a: int, b: int):
+    """Swap (row, a) and (row, b) in place and update counts and conflict count."""
+    grid = state.grid
+    r = row * 9
+    va = grid[r+a]
+    vb = grid[r+b]
+    if va == vb:
+        return
+    grid[r+a] = vb
+    grid[r+b] = va
+    _replace(state, a * 10, va, vb)
+    _replace(state, b * 10, vb, va)
+    o = _BLOCK_OFFSET[row][a]
+    p = _BLOCK_OFFSET[row][b]
+    if o != p:
+        _replace(state, o, va, vb)
+        _replace(state, p, vb, va)
+    if row == a:
+        _replace(state, _DIAG1, va, vb)
+    elif row == b:
+        _replace(state, _DIAG1, vb, va)
+    if row + a == 8:
+        _replace(state, _DIAG2, va, vb)
+    elif row + b == 8:
+        _replace(state, _DIAG2, vb, va)
@@ -3,10 +3,13 @@ This module defines move operations for Sudoku optimization algorithms.
 Includes:
 - Move type definition
 - Functions to swap values in rows, columns, blocks, and diagonals while respecting fixed cells
-- Utilities for move normalization and candidate generation
+- Utilities for move normalization and per-row free columns
+- Runtime code generation of a candidate sampler specialized for a puzzle's fixed cells
+- Full row-swap neighbourhood enumeration (for exhaustive best-improvement scans)
 
-Note: The Tabu Search algorithm uses only row swaps (swapInRow) to preserve row validity.
-Other swap functions are provided for potential alternative strategies.
+Note: The Tabu Search algorithm uses only row swaps to preserve row validity, drawn by
+buildSpecializedSwap or enumerated by allRowSwaps. The grid-copying swap functions
+are provided for potential alternative strategies.
 """
 
 import random
@@ -15,6 +18,8 @@ from sudoku import Grid
 
 # Move type: a swap between two (row, col) positions
 Move = Tuple[Tuple[int, int], Tuple[int, int]]
+# Row swap: exchange (row, a) and (row, b), with a < b
+RowSwap = Tuple[int, int, int]
 
 def swapInColumn(grid: Grid, fixedMask: List[List[bool]], rng: Optional[random.Random] = None) -> Tuple[Grid, Move]:
     """Swap two unfixed positions in a random column."""
@@ -111,17 +116,39 @@ def normalizeMove(move: Move) -> Move:
     else:
         return ((b1, b2), (a1, a2))
 
-def generateCandidates(grid: Grid, fixedMask: List[List[bool]], sampleSize: int = 200, rng: Optional[random.Random] = None):
-    """Generate a list of candidate (grid, move) pairs.
-    All moves are row swaps to preserve row uniqueness (essential constraint for Sudoku).
-    Returns list of (new_grid, move) tuples."""
-    if rng is None:
-        rng = random.Random()
-    cand = []
-    for _ in range(sampleSize):
-        # Only use row swaps to preserve row constraint
-        g, m = swapInRow(grid, fixedMask, rng)
-        if m == ((-1, -1), (-1, -1)):
-            continue
-        cand.append((g, m))
-    return cand
+def rowFreeColumns(fixedMask: List[List[bool]]) -> List[Tuple[int, ...]]:
+    """Return, for every row, the tuple of unfixed column indices.
+    The fixed mask never changes during a search, so this is computed once per puzzle."""
+    return [tuple(j for j in range(9) if not fixedMask[i][j]) for i in range(9)]
+
+def rowSwapTable(fixedMask: List[List[bool]]) -> Tuple[Tuple[RowSwap, ...], ...]:
+    """Return, for every row, the tuple of all legal swaps (row, a, b) with a < b
+    between its unfixed cells."""
+    rowFree = rowFreeColumns(fixedMask)
+    return tuple(tuple((i, a, b) for k, a in enumerate(rf) for b in rf[k + 1:]) for i, rf in enumerate(rowFree))
+
+def allRowSwaps(fixedMask: List[List[bool]]) -> Tuple[RowSwap, ...]:
+    """Return the full row-swap neighbourhood of a puzzle (at most 9 * C(9, 2) = 324 moves)."""
+    return tuple(m for rs in rowSwapTable(fixedMask) for m in rs)
+
+def buildSpecializedSwap(fixedMask: List[List[bool]]):
+    """Compile a candidate generator specialized for one puzzle's fixed cells.
+    Returns a function generate(sampleSize, rng) -> Iterator[RowSwap] that lazily draws
+    sampleSize row swaps (row, a, b) with a < b: a uniform row, then a uniform pair of its
+    free cells. Draws landing on a row with fewer than two free cells yield nothing."""
+    swaps = rowSwapTable(fixedMask)
+    sizes = {len(rs) for rs in swaps}
+    if len(sizes) == 1 and 0 not in sizes:
+        # every row has the same number of swaps (e.g. the empty puzzle): index directly
+        draw = f"{swaps!r}[int(random() * 9)][int(random() * {sizes.pop()})] for _ in range(sampleSize)"
+    else:
+        rows = f"({swaps!r}[int(random() * 9)] for _ in range(sampleSize))"
+        draw = f"rs[int(random() * len(rs))] for rs in {rows} if rs"
+    lines = [
+        "def generate(sampleSize, rng):",
+        "    random = rng.random",
+        f"    return ({draw})",
+    ]
+    namespace = {}
+    exec(compile("\n".join(lines), "<specialized swap>", "exec"), namespace)
+    return namespace["generate"]
@@ -3,7 +3,7 @@ This script provides a command-line interface for running Tabu Search experiment
 Includes:
 - Argument parsing for experiment configuration
 - Functions to run single or batch tests
-- Output of results to console and CSV files
+- Output of results to console, CSV files and HTML files
 """
 import argparse
 import time
@@ -13,6 +13,25 @@ from pathlib import Path
 from sudoku import loadPuzzle, printGrid
 from tabuSearch import tabuSearch
 
+# HTML visualization of one run, written in a single call per file
+HTML_TEMPLATE = (
+    '<html><head><meta charset="utf-8"><title>Sudoku Solution</title>'
+    '<style>table{{border-collapse:collapse;}}td{{width:30px;height:30px;text-align:center;'
+    'font-size:18px;border:1px solid #888;}} .block{{border:2px solid #000;}}</style></head><body>'
+    '<h2>Test case: {name} (repeat {r}) - {ts}</h2>'
+    '<h3>Initial puzzle</h3>'
+    '<table>{init_rows}</table>'
+    '{result}'
+    '</body></html>'
+)
+
+def gridRowsHtml(grid):
+    """Return the table rows of a grid as HTML (empty cells left blank)."""
+    return "".join(
+        "<tr>" + "".join(f'<td class="block">{val or ""}</td>' for val in row) + "</tr>"
+        for row in grid
+    )
+
 def runSingle(puzzlePath, params):
     """Run Tabu Search on a single puzzle and display results."""
     puzzle = loadPuzzle(puzzlePath)
@@ -28,7 +47,9 @@ def runSingle(puzzlePath, params):
                                        tabu_tenure=params.tabu_tenure,
                                        neighbour_sample_size=params.neighbour_sample_size,
                                        no_improve_limit=params.no_improve_limit,
-                                       seed=params.seed)
+                                       seed=params.seed,
+                                       workers=params.workers,
+                                       full_neighborhood=params.full_neighborhood)
     print("Finished. Best cost:", best_cost, "info:", info)
     printGrid(best)
     return best, best_cost, info
@@ -49,7 +70,7 @@ def runBatch(folder, outCsv, repeats, params):
     
     with open(outCsv, 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(['puzzle','repeat','seed','best_cost','found','iter','time_s','tabu_tenure','neighbour_sample_size'])
+        writer.writerow(['puzzle','repeat','seed','best_cost','found','iter','time_s','tabu_tenure','neighbour_sample_size','full_neighborhood','workers'])
         for p in puzzles:
             found_solution = False
             for r in range(1, repeats+1):  # Start with rep 1
@@ -74,44 +95,22 @@ def runBatch(folder, outCsv, repeats, params):
                                                    tabu_tenure=params.tabu_tenure,
                                                    neighbour_sample_size=params.neighbour_sample_size,
                                                    no_improve_limit=params.no_improve_limit,
-                                                   seed=seed)
-                writer.writerow([p.name, r, seed, info['best_cost'], info['found'], info['iter'], info['time_s'], params.tabu_tenure, params.neighbour_sample_size])
+                                                   seed=seed,
+                                                   workers=params.workers,
+                                                   full_neighborhood=params.full_neighborhood)
+                writer.writerow([p.name, r, seed, info['best_cost'], info['found'], info['iter'], info['time_s'], params.tabu_tenure, params.neighbour_sample_size, params.full_neighborhood, params.workers])
                 # Save HTML visualization for every run
                 html_path = results_dir / f"{p.name}_rep{r}.html"
                 timestamp = datetime.datetime.now().strftime('%d/%m/%Y %H:%M')
-                with open(html_path, 'w', encoding='utf-8') as htmlf:
-                    htmlf.write('<html><head><meta charset="utf-8"><title>Sudoku Solution</title>')
-                    htmlf.write('<style>table{border-collapse:collapse;}td{width:30px;height:30px;text-align:center;font-size:18px;border:1px solid #888;} .block{border:2px solid #000;}</style></head><body>')
-                    htmlf.write(f'<h2>Test case: {p.name} (repeat {r}) - {timestamp}</h2>')
-                    htmlf.write('<h3>Initial puzzle</h3>')
-                    htmlf.write('<table>')
-                    for i, row in enumerate(puzzle_grid):
-                        htmlf.write('<tr>')
-                        for j, val in enumerate(row):
-                            htmlf.write(f'<td class="block">{val if val != 0 else ""}</td>')
-                        htmlf.write('</tr>')
-                    htmlf.write('</table>')
-                    if info['found']:
-                        htmlf.write('<h3>Solution</h3>')
-                        htmlf.write('<table>')
-                        for i, row in enumerate(best):
-                            htmlf.write('<tr>')
-                            for j, val in enumerate(row):
-                                htmlf.write(f'<td class="block">{val}</td>')
-                            htmlf.write('</tr>')
-                        htmlf.write('</table>')
-                        found_solution = True
-                    else:
-                        htmlf.write(f'<h3>No solution found. Best cost: {info["best_cost"]}</h3>')
-                        htmlf.write('<h4>Best grid found:</h4>')
-                        htmlf.write('<table>')
-                        for i, row in enumerate(best):
-                            htmlf.write('<tr>')
-                            for j, val in enumerate(row):
-                                htmlf.write(f'<td class="block">{val}</td>')
-                            htmlf.write('</tr>')
-                        htmlf.write('</table>')
-                    htmlf.write('</body></html>')
+                if info['found']:
+                    result_html = f'<h3>Solution</h3><table>{gridRowsHtml(best)}</table>'
+                    found_solution = True
+                else:
+                    result_html = (f'<h3>No solution found. Best cost: {info["best_cost"]}</h3>'
+                                   f'<h4>Best grid found:</h4><table>{gridRowsHtml(best)}</table>')
+                html = HTML_TEMPLATE.format(name=p.name, r=r, ts=timestamp,
+                                            init_rows=gridRowsHtml(puzzle_grid), result=result_html)
+                html_path.write_text(html, encoding='utf-8')
 
 def parseArgs():
     """Parse command-line arguments for Tabu Search experiments."""
@@ -125,6 +124,8 @@ def parseArgs():
     p.add_argument('--neighbour_sample_size', type=int, default=200)
     p.add_argument('--no_improve_limit', type=int, default=30000)
     p.add_argument('--seed', type=int, default=0, help='random seed (use -1 for truly random)')
+    p.add_argument('--workers', type=int, default=1, help='processes running restart attempts in parallel')
+    p.add_argument('--full_neighborhood', action='store_true', help='scan all row swaps each iteration instead of sampling')
     return p.parse_args()
 
 if __name__ == "__main__":
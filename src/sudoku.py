@@ -1,39 +1,65 @@
 """
 This module provides core data structures and utility functions for Sudoku puzzles.
 Includes:
-- Grid type definition
+- Grid type definitions (nested lists and flat bytearray) with conversion shims
 - Functions to load and save Sudoku grids from/to JSON files
 - Utility to generate a mask of fixed (given) cells
 """
+from itertools import chain
 from typing import List, Tuple
 import json
 
 Grid = List[List[int]]
+# Flat grid used inside the search: cell (i, j) is stored at index i*9 + j, so a copy
+# is a single memcpy (bytes(ba) / ba[:]) instead of ten list allocations.
+GridBA = bytearray
+
+def fromList(grid: Grid) -> GridBA:
+    """Convert a nested-list grid to a flat bytearray grid."""
+    return bytearray(v for row in grid for v in row)
+
+def toList(grid) -> Grid:
+    """Convert a flat grid (bytearray or bytes snapshot) back to nested lists."""
+    return [list(grid[i:i+9]) for i in range(0, 81, 9)]
+
+# Packed digit histograms (SWAR): every constraint group owns a 40-bit field of ten
+# 4-bit counters, one per value 0..9, so the histograms of all groups live in a single
+# int. A group holds 9 cells, so a counter never overflows into its neighbour.
+# Group order: 9 columns, 9 blocks, main diagonal, anti-diagonal, 9 rows.
+_COST_GROUPS = 20   # rows are excluded from the cost (row swaps keep them valid)
+_ALL_GROUPS = 29
+
+def _cellGroups(i: int, j: int) -> List[int]:
+    groups = [j, 9 + (i // 3) * 3 + j // 3]
+    if i == j:
+        groups.append(18)
+    if i + j == 8:
+        groups.append(19)
+    groups.append(20 + i)
+    return groups
+
+def _nibbleTable(ngroups: int) -> List[List[int]]:
+    """Per-cell histogram increments in row-major cell order: table[i*9 + j][v] counts
+       value v placed at (i, j) in every one of the first ngroups groups containing it."""
+    return [[sum(1 << (40 * g + 4 * v) for g in _cellGroups(i, j) if g < ngroups) for v in range(10)]
+            for i in range(9) for j in range(9)]
+
+_CELL_NIBBLES = _nibbleTable(_ALL_GROUPS)
+_CELL_COST_NIBBLES = _nibbleTable(_COST_GROUPS)   # narrower ints for computeCost
+_COST_NIBBLE_LOW = sum(1 << (4 * k) for k in range(10 * _COST_GROUPS))   # lowest bit of every counter
+_ALL_DIGITS = sum(0x1111111110 << (40 * g) for g in range(_ALL_GROUPS))   # 1..9 once per group
+
+# popcount: int.bit_count on Python 3.10+, string count on older versions
+_popcount = getattr(int, 'bit_count', None) or (lambda x: bin(x).count('1'))
+
+def _histogram(grid: Grid, table: List[List[int]]) -> int:
+    """Packed digit histograms of the grid, one table lookup per cell and no branches."""
+    return sum(map(list.__getitem__, table, chain.from_iterable(grid)))
 
 # Strict validator: returns True only if grid is a valid Sudoku solution
 def isValidSudoku(grid: Grid) -> bool:
-    # Check rows and columns
-    for i in range(9):
-        row = [x for x in grid[i]]
-        col = [grid[j][i] for j in range(9)]
-        if set(row) != set(range(1, 10)):
-            return False
-        if set(col) != set(range(1, 10)):
-            return False
-    # Check blocks
-    for bi in range(3):
-        for bj in range(3):
-            block = [grid[bi*3 + i][bj*3 + j] for i in range(3) for j in range(3)]
-            if set(block) != set(range(1, 10)):
-                return False
-    # Check diagonals (Sudoku X)
-    diag1 = [grid[i][i] for i in range(9)]
-    diag2 = [grid[i][8-i] for i in range(9)]
-    if set(diag1) != set(range(1, 10)):
-        return False
-    if set(diag2) != set(range(1, 10)):
-        return False
-    return True
+    # Rows, columns, blocks and diagonals (Sudoku X) must each hold 1..9 exactly once
+    return _histogram(grid, _CELL_NIBBLES) == _ALL_DIGITS
 
 def loadPuzzle(path: str) -> Grid:
     """Load puzzle from JSON file: 9x9 list of lists with 0 = empty"""
@@ -70,25 +96,11 @@ def isSolved(grid: Grid) -> bool:
 def computeCost(grid: Grid) -> int:
     """Cost for Sudoku X: number of conflicts in columns, blocks, and both diagonals.
        Lower is better; 0 means valid solution."""
-    c = 0
-    # columns
-    for j in range(9):
-        col = [grid[i][j] for i in range(9)]
-        c += 9 - len(set(col))
-    # blocks
-    for bi in range(3):
-        for bj in range(3):
-            block = []
-            for i in range(3):
-                for j in range(3):
-                    block.append(grid[bi*3+i][bj*3+j])
-            c += 9 - len(set(block))
-    # diagonals (Sudoku X)
-    diag1 = [grid[i][i] for i in range(9)]
-    diag2 = [grid[i][8-i] for i in range(9)]
-    c += 9 - len(set(diag1))
-    c += 9 - len(set(diag2))
-    return c
+    # conflicts of a group = 9 - number of distinct values = 9 - non-zero counters
+    h = _histogram(grid, _CELL_COST_NIBBLES)
+    h |= h >> 1
+    h |= h >> 2
+    return 9 * _COST_GROUPS - _popcount(h & _COST_NIBBLE_LOW)
 
 # alias to match earlier names
 cost = computeCost
@@ -1,110 +1,196 @@
 """
 This module implements the Tabu Search metaheuristic for solving Sudoku puzzles.
 Includes:
-- The main tabu_search algorithm
+- The main tabu_search algorithm (single attempt and restart driver)
+- Optional parallel execution of restart attempts in a process pool
 - Integration with initial solution and move generation modules
 - Utilities for tracking search progress and best solutions
 """
 import time
-from typing import Tuple, List, Dict, Optional
-from sudoku import Grid, computeCost, fixedMask, printGrid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+from sudoku import Grid, fixedMask, printGrid, fromList, toList, isValidSudoku
+from kernel import buildState, selectSwap, applySwap, FULL_MASK
 from init import initialSolution
-from moves import generateCandidates, normalizeMove
+from moves import buildSpecializedSwap, allRowSwaps
 import random
 
+MAX_RESTARTS = 20  # Maximum random restarts allowed
+STOP_CHECK_EVERY = 64  # Iterations between checks of the parallel stop signal
+
+# Set in worker processes: lowest index of an attempt that found a solution so far;
+# running attempts with a higher index stop, lower ones run on
+_solved_attempt = None
+
+def _initWorker(solved_attempt):
+    global _solved_attempt
+    _solved_attempt = solved_attempt
+
+def tabuSearchOnce(puzzle: Grid,
+                   max_iter: int = 100000,
+                   tabu_tenure: int = 25,
+                   neighbour_sample_size: int = 500,
+                   no_improve_limit: int = 50000,
+                   seed: Optional[int] = None,
+                   full_neighborhood: bool = False,
+                   attempt: int = 0):
+    """Run a single Tabu Search attempt (no restarts) from a fresh initial solution.
+    Each iteration scores neighbour_sample_size sampled row swaps, or with
+    full_neighborhood every legal row swap (at most 324) for a best-improvement step.
+    Stops when a solution is found, after no_improve_limit iterations without
+    improvement, after max_iter iterations, or in a worker process once an attempt
+    with a lower index than `attempt` has found a solution.
+
+    Returns: (best_grid, best_cost, info_dict) with info keys 'iter' and 'no_improve';
+        best_grid is the flat 81-byte snapshot (see sudoku.GridBA), convert with toList
+    """
+    rng = random.Random(seed)
+    fixed = fixedMask(puzzle)
+    if full_neighborhood:
+        neighbourhood = allRowSwaps(fixed)  # the same moves are scanned every iteration
+    else:
+        generate = buildSpecializedSwap(fixed)  # candidate sampler compiled for this puzzle
+    grid = initialSolution(puzzle, seed=seed)
+    state = buildState(fromList(grid))
+    # Row swaps never change row contents, so once every row holds 1..9 a zero
+    # conflict count (columns, blocks, diagonals) already means a valid solution
+    assert all(m == FULL_MASK for m in state.row_mask), "initial solution must fill every row with 1..9"
+    best_grid = bytes(state.grid)  # immutable snapshot of the best flat grid
+    best_cost = state.dup_count
+    cur_cost = best_cost
+
+    # Tabu list: tabu[row][a][b] = expiration iteration of swap (row, a) <-> (row, b), a < b
+    tabu = [[[0] * 9 for _ in range(9)] for _ in range(9)]
+    iter_no_improve = 0
+    iter_count = 0
+
+    # Run until no improvement limit reached or solution found
+    while iter_no_improve < no_improve_limit and iter_count < max_iter and best_cost > 0:
+        iter_count += 1
+        if _solved_attempt is not None and iter_count % STOP_CHECK_EVERY == 0 and _solved_attempt.value < attempt:
+            break
+        # Draw candidate row swaps, score them by cost change and select one in a single
+        # fused pass: best non-tabu move, or a tabu move better than best (aspiration),
+        # or else the best move even if tabu (diversification)
+        candidates = neighbourhood if full_neighborhood else generate(neighbour_sample_size, rng)
+        move, _ = selectSwap(state, candidates, tabu, iter_count, best_cost - cur_cost)
+        if move is None:
+            continue
+        row, a, b = move
+        applySwap(state, row, a, b)
+        cur_cost = state.dup_count
+        tabu[row][a][b] = iter_count + tabu_tenure
+
+        # Update best solution found so far
+        if cur_cost < best_cost:
+            best_cost = cur_cost
+            best_grid = bytes(state.grid)
+            iter_no_improve = 0
+        else:
+            iter_no_improve += 1
+
+    info = {
+        'iter': iter_count,
+        'no_improve': iter_no_improve
+    }
+    return best_grid, best_cost, info
+
 def tabuSearch(puzzle: Grid,
                 max_iter: int = 100000,
                 tabu_tenure: int = 25,
                 neighbour_sample_size: int = 500,
                 no_improve_limit: int = 50000,
                 seed: Optional[int] = None,
-                verbose: bool = True):
+                verbose: bool = True,
+                workers: int = 1,
+                full_neighborhood: bool = False):
     """Solve Sudoku X puzzle using Tabu Search with random restarts.
-    
+    Attempt k (k = 0 is the first run, k >= 1 are restarts) is seeded with seed + k.
+    With workers == 1 attempts run one after another and share the max_iter budget.
+    With workers > 1 attempts run concurrently in a process pool, each bounded by
+    max_iter. A solved attempt stops the ones with a higher index, and the solved
+    attempt with the lowest index is returned, so a fixed seed still gives the same
+    grid (it may differ from the workers == 1 result, whose budget is shared).
+    In that mode info['iter'] sums the iterations of all finished attempts, so it
+    can exceed max_iter and varies with scheduling; info['restarts'] is the index of
+    the returned attempt, and no restart lines are printed.
+    full_neighborhood scans every legal row swap per iteration instead of sampling
+    neighbour_sample_size of them (see tabuSearchOnce).
+
     Returns: (best_grid, best_cost, info_dict)
         best_grid: Best solution found (9x9 grid)
         best_cost: Cost of best solution (0 = valid solution)
         info_dict: Statistics (iterations, time, restarts, etc.)
     """
-    rng = random.Random(seed)
-    fixed = fixedMask(puzzle)
-    grid = initialSolution(puzzle, seed=seed)
-    best_grid = [row[:] for row in grid]
-    best_cost = computeCost(grid)
-    cur_grid = [row[:] for row in grid]
-    cur_cost = best_cost
+    def attemptSeed(k):
+        return (seed + k) if seed is not None else None
 
-    tabu: Dict[Tuple, int] = {}  # Tabu list: move -> expiration iteration
+    best_grid = None
+    best_cost = None
+    total_iter = 0
     iter_no_improve = 0
-    iter_count = 0
     restarts = 0
-    max_restarts = 20  # Maximum random restarts allowed
-    total_iter = 0
     start_time = time.perf_counter()
 
-    from sudoku import isValidSudoku
-
-    while iter_count < max_iter and best_cost > 0 and restarts <= max_restarts:
-        # Inner loop: run until no improvement limit reached or solution found
-        while iter_no_improve < no_improve_limit and iter_count < max_iter and best_cost > 0:
-            iter_count += 1
-            total_iter += 1
-            # Generate candidate neighbor solutions
-            candidates = generateCandidates(cur_grid, fixed, sampleSize=neighbour_sample_size, rng=rng)
-            # Evaluate all candidates and sort by cost
-            scored = []
-            for g, m in candidates:
-                c = computeCost(g)
-                scored.append((c, g, m))
-            if not scored:
-                continue
-            scored.sort(key=lambda x: x[0])
-            moved = False
-            # Select best non-tabu move, or use aspiration criterion (accept tabu if better than best)
-            for c, g, m in scored:
-                m_key = normalizeMove(m)
-                is_tabu = (m_key in tabu and tabu[m_key] > iter_count)
-                if (not is_tabu) or (c < best_cost):  # aspiration
-                    cur_grid = g
-                    cur_cost = c
-                    tabu[m_key] = iter_count + tabu_tenure
-                    moved = True
-                    break
-            if not moved:
-                # Fallback: accept best move even if tabu (diversification)
-                c, g, m = scored[0]
-                cur_grid = g
-                cur_cost = c
-                tabu[normalizeMove(m)] = iter_count + tabu_tenure
-
-            # Update best solution found so far
-            if cur_cost < best_cost:
-                best_cost = cur_cost
-                best_grid = [row[:] for row in cur_grid]
-                iter_no_improve = 0
-            else:
-                iter_no_improve += 1
-
-            # Early exit if valid solution found
-            if best_cost == 0 and isValidSudoku(best_grid):
+    if workers <= 1:
+        for k in range(MAX_RESTARTS + 1):
+            if k > 0:
+                # Random restart: escape local minimum by re-initializing
+                restarts = k
+                if verbose:
+                    print(f"↻ Restart #{restarts}")
+            grid, cost, attempt = tabuSearchOnce(puzzle,
+                                                 max_iter=max_iter - total_iter,
+                                                 tabu_tenure=tabu_tenure,
+                                                 neighbour_sample_size=neighbour_sample_size,
+                                                 no_improve_limit=no_improve_limit,
+                                                 seed=attemptSeed(k),
+                                                 full_neighborhood=full_neighborhood)
+            total_iter += attempt['iter']
+            iter_no_improve = attempt['no_improve']
+            if best_cost is None or cost < best_cost:
+                best_grid, best_cost = grid, cost
+            if best_cost == 0 or total_iter >= max_iter:
                 break
-
-        # Random restart: escape local minimum by re-initializing
-        if best_cost > 0 and iter_no_improve >= no_improve_limit and restarts < max_restarts:
-            restarts += 1
-            if verbose:
-                print(f"↻ Restart #{restarts}")
-            cur_grid = initialSolution(puzzle, seed=(seed + restarts) if seed is not None else None)
-            cur_cost = computeCost(cur_grid)
-            tabu = {}
-            iter_no_improve = 0
-            # Update best if restart produces better initial solution
-            if cur_cost < best_cost:
-                best_cost = cur_cost
-                best_grid = [row[:] for row in cur_grid]
+    else:
+        solved_attempt = multiprocessing.RawValue('i', MAX_RESTARTS + 1)  # written by this process only
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker,
+                                 initargs=(solved_attempt,)) as ex:
+            futures = {ex.submit(tabuSearchOnce, puzzle,
+                                 max_iter=max_iter,
+                                 tabu_tenure=tabu_tenure,
+                                 neighbour_sample_size=neighbour_sample_size,
+                                 no_improve_limit=no_improve_limit,
+                                 seed=attemptSeed(k),
+                                 full_neighborhood=full_neighborhood,
+                                 attempt=k): k
+                       for k in range(MAX_RESTARTS + 1)}
+            results = {}
+            for f in as_completed(futures):
+                if f.cancelled():
+                    continue
+                k = futures[f]
+                results[k] = f.result()
+                total_iter += results[k][2]['iter']
+                if results[k][1] == 0 and k < solved_attempt.value:
+                    # Stop running attempts with a higher index and drop the ones not started yet;
+                    # lower ones run on, since one of them may also find a solution
+                    solved_attempt.value = k
+                    for other, j in futures.items():
+                        if j > k:
+                            other.cancel()
+            # Lowest cost, ties (e.g. several solutions) broken by the lowest attempt index
+            k = min(results, key=lambda j: (results[j][1], j))
+            best_grid, best_cost, attempt = results[k]
+            iter_no_improve = attempt['no_improve']
+            restarts = k  # attempt k is restart #k, as with workers == 1
 
     elapsed = time.perf_counter() - start_time
-    found = (best_cost == 0 and isValidSudoku(best_grid))
+    best_grid = toList(best_grid)
+    found = (best_cost == 0)
+    if __debug__ and found:
+        assert isValidSudoku(best_grid), "zero-cost grid failed full validation"
     
     if verbose:
         status = "✓" if found else "✗"